@@ -1,4 +1,5 @@
 from common.util import *
+from typing import List, Optional, Tuple
 
 # --- Day 1: Report Repair ---
 # After saving Christmas five years in a row, you've decided to take a vacation at a nice resort on a tropical island.
@@ -29,14 +30,155 @@ from common.util import *
 # Find the two entries that sum to 2020; what do you get if you multiply them together?
 
 
-def part1(data):
-    nums = [int(i) for i in data]
+def two_sum(nums: List[int], target: int) -> Optional[Tuple[int, int]]:
+    # Only earlier entries are in seen, so a value pairs with itself only
+    # when it appears twice
+    seen = set()
     for n in nums:
-        if 2020 - n in nums:
-            return n * (2020 - n)
+        if target - n in seen:
+            return (target - n, n)
+        seen.add(n)
+
+
+def three_sum(nums: List[int], target: int) -> Optional[Tuple[int, int, int]]:
+    nums = sorted(nums)
+
+    for i in range(len(nums) - 2):
+        if i and nums[i] == nums[i - 1]:
+            continue
+
+        l, r = i + 1, len(nums) - 1
+        while l < r:
+            total = nums[i] + nums[l] + nums[r]
+            if total < target:
+                l += 1
+            elif total > target:
+                r -= 1
+            else:
+                return (nums[i], nums[l], nums[r])
+
+
+def meet_in_the_middle(nums: List[int], k: int, target: int) -> Optional[Tuple]:
+    from collections import defaultdict
+    from itertools import combinations
+
+    # Index combinations of the smaller half, grouped by their sum
+    half = k // 2
+    sums = defaultdict(list)
+    for combo in combinations(range(len(nums)), half):
+        sums[sum(nums[i] for i in combo)].append(combo)
+
+    for combo in combinations(range(len(nums)), k - half):
+        rest = target - sum(nums[i] for i in combo)
+        for other in sums.get(rest, ()):
+            if not set(combo) & set(other):
+                return tuple(nums[i] for i in other + combo)
+
+
+def k_sum(nums: List[int], k: int, target: int = 2020) -> Optional[Tuple]:
+    """Find k entries (by position, so duplicates count) summing to target."""
+    if k == 1:
+        return (target,) if target in set(nums) else None
+    if k == 2:
+        return two_sum(nums, target)
+    if k == 3:
+        return three_sum(nums, target)
+    return meet_in_the_middle(nums, k, target)
+
+
+# Batched NumPy path: sort the report once and answer many targets with
+# searchsorted over blocks of (target, entry) complements.
+
+BLOCK_SIZE = 1 << 22
+COLUMN_BLOCK = 1 << 12
+
+
+def expense_array(nums: List[int]):
+    import numpy as np
+
+    return np.sort(np.asarray(nums, dtype=np.int64))
+
+
+def batch_pair_sums(nums, targets: List[int]) -> List[Optional[Tuple[int, int]]]:
+    """Pair of entries summing to each target, nums from expense_array."""
+    import numpy as np
+
+    targets = np.asarray(targets, dtype=np.int64)
+    results = [None] * len(targets)
+    pending = np.arange(len(targets))
+
+    # Walk the entries in column blocks so targets found early drop out
+    width = min(len(nums), COLUMN_BLOCK) or 1
+    for col in range(0, len(nums), width):
+        if not len(pending):
+            break
 
+        block = nums[col : col + width]
+        step = max(BLOCK_SIZE // width, 1)
+        solved = []
+        for start in range(0, len(pending), step):
+            rows = pending[start : start + step]
+            complements = targets[rows, None] - block[None, :]
+            left = np.searchsorted(nums, complements, "left")
+            right = np.searchsorted(nums, complements, "right")
 
-print(solution("day01", part1, split_parser))
+            # An entry can only be its own complement if the value is repeated
+            found = (right - left) - (complements == block[None, :]) > 0
+            hit = found.any(axis=1)
+            first = found.argmax(axis=1)
+            for row in np.flatnonzero(hit):
+                n = int(block[first[row]])
+                results[rows[row]] = (n, int(targets[rows[row]]) - n)
+                solved.append(rows[row])
+
+        pending = np.setdiff1d(pending, solved)
+
+    return results
+
+
+def batch_triple_sums(nums, targets: List[int]) -> List[Optional[Tuple[int, ...]]]:
+    """Triple of entries (i < j < k) summing to each target."""
+    import numpy as np
+
+    targets = np.asarray(targets, dtype=np.int64)
+    results = [None] * len(targets)
+    pending = np.arange(len(targets))
+
+    for i in range(len(nums) - 2):
+        if not len(pending):
+            break
+
+        # For each pending target, look for k > j among later entries
+        rest = nums[i + 1 :]
+        step = max(BLOCK_SIZE // len(rest), 1)
+        solved = []
+        for start in range(0, len(pending), step):
+            rows = pending[start : start + step]
+            complements = (targets[rows, None] - nums[i]) - rest[None, :]
+            k = np.searchsorted(rest, complements, "right") - 1
+            found = (k > np.arange(len(rest))) & (rest[np.maximum(k, 0)] == complements)
+
+            hit = found.any(axis=1)
+            first = found.argmax(axis=1)
+            for row in np.flatnonzero(hit):
+                a, b = int(nums[i]), int(rest[first[row]])
+                results[rows[row]] = (a, b, int(targets[rows[row]]) - a - b)
+                solved.append(rows[row])
+
+        pending = np.setdiff1d(pending, solved)
+
+    return results
+
+
+def part1(data):
+    from math import prod
+
+    entries = k_sum([int(i) for i in data], 2)
+    return prod(entries) if entries else None
+
+
+if __name__ == "__main__":
+    print(solution("day01", part1, split_parser))
 
 # ----------- TEST
 test1 = """
@@ -53,6 +195,20 @@ def test_answer():
     assert part1(test1.split()) == 514579
 
 
+def test_k_sum():
+    nums = [int(i) for i in test1.split()]
+    assert sorted(k_sum(nums, 3)) == [366, 675, 979]
+    assert k_sum([1010, 5], 2) is None
+    assert k_sum([1010, 5, 1010], 2) == (1010, 1010)
+    assert sum(k_sum(nums + [1, 2, 3], 4, 2023)) == 2023
+
+
+def test_batch_sums():
+    nums = expense_array([int(i) for i in test1.split()] + [1010])
+    assert batch_pair_sums(nums, [2020, 2019, 2020 * 2]) == [(299, 1721), None, None]
+    assert batch_triple_sums(nums, [2020, 1]) == [(366, 675, 979), None]
+
+
 # --- Part Two ---
 # The Elves in accounting are thankful for your help;
 # one of them even offers you a starfish coin they had left over from a past vacation.
@@ -65,13 +221,11 @@ def test_answer():
 
 
 def part2(data):
-    expenses = [int(n) for n in data]
-    for idx, expense in enumerate(expenses):
-        others = expenses[:idx] + expenses[idx + 1 :]
-        target = 2020 - expense
-        for o in others:
-            if target - o in others:
-                return expense * o * (target - o)
+    from math import prod
+
+    entries = k_sum([int(n) for n in data], 3)
+    return prod(entries) if entries else None
 
 
-print(solution("day01", part2, split_parser))
+if __name__ == "__main__":
+    print(solution("day01", part2, split_parser))
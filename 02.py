@@ -1,4 +1,8 @@
 from common.util import *
+from array import array
+from collections import namedtuple
+from typing import Iterable, Tuple
+import re
 
 # --- Day 2: Password Philosophy ---
 # Your flight departs in a few days from the coastal airport; the easiest way down to the coast from here is via toboggan.
@@ -26,27 +30,162 @@ from common.util import *
 # How many passwords are valid according to their policies?
 
 
-def part1(data):
-    from collections import Counter
+# Policies are kept column-wise: one array per field and every password
+# concatenated into a single buffer, sliced by starts[i]:starts[i + 1].
+Policies = namedtuple("Policies", ["lows", "highs", "letters", "starts", "buffer"])
 
-    valid = 0
+POLICY = re.compile(r"^(\d+)-(\d+) (\w): (\w+)\r?$", re.MULTILINE)
+
+
+def build_policies(chunks: Iterable[str]) -> Policies:
+    """Build the columns from blocks of whole lines, one findall per block."""
+    from itertools import accumulate
+
+    lows, highs, starts = array("i"), array("i"), array("q", [0])
+    letters, passwords = [], []
+
+    for chunk in chunks:
+        matches = POLICY.findall(chunk)
+        lines = chunk.count("\n") + (not chunk.endswith("\n")) if chunk else 0
+        if len(matches) != lines:
+            bad = next(line for line in chunk.split("\n") if not POLICY.match(line))
+            raise ValueError(f"malformed password policy {bad!r}")
+        if not matches:
+            continue
+
+        low, high, letter, password = zip(*matches)
+        lows.extend(map(int, low))
+        highs.extend(map(int, high))
+        letters.extend(letter)
+        passwords.extend(password)
+        offset = starts[-1]
+        starts.extend(offset + end for end in accumulate(map(len, password)))
+
+    return Policies(lows, highs, "".join(letters), starts, "".join(passwords))
+
+
+def policy_parser(data: str) -> Policies:
+    return build_policies([data])
+
+
+def parse_policies(lines: Iterable[str], batch_size: int = 1 << 16) -> Policies:
+    from itertools import islice
 
-    for line in data:
-        d = line.split()
-        policy, letter, password = d[0], d[1][:-1], d[2]
+    lines = iter(lines)
+    batches = iter(lambda: list(islice(lines, batch_size)), [])
 
-        minimum = int(policy.split("-")[0])
-        maximum = int(policy.split("-")[1])
+    return build_policies("\n".join(batch) for batch in batches)
 
-        c = Counter(password)
 
-        if minimum <= c[letter] <= maximum:
-            valid += 1
+def count_sled_valid(policies: Policies) -> int:
+    count = policies.buffer.count
+    starts = policies.starts
+
+    return sum(
+        low <= count(letter, start, end) <= high
+        for low, high, letter, start, end in zip(
+            policies.lows, policies.highs, policies.letters, starts, starts[1:]
+        )
+    )
+
+
+def count_toboggan_valid(policies: Policies) -> int:
+    buffer, starts = policies.buffer, policies.starts
+    valid = 0
+
+    for low, high, letter, start, end in zip(
+        policies.lows, policies.highs, policies.letters, starts, starts[1:]
+    ):
+        first, second = start + low - 1, start + high - 1
+        # Positions past the end of a password never hold the letter
+        valid += (first < end and buffer[first] == letter) != (
+            second < end and buffer[second] == letter
+        )
 
     return valid
 
 
-print(solution("day02", part1, line_parser))
+def validate_range(path: str, start: int, end: int, chunk_size: int) -> Tuple[int, int]:
+    sled = toboggan = 0
+    for chunk in range_chunks(path, start, end, chunk_size):
+        policies = build_policies([chunk])
+        sled += count_sled_valid(policies)
+        toboggan += count_toboggan_valid(policies)
+
+    return sled, toboggan
+
+
+def validate_parallel(
+    filename: str, workers: int = None, chunk_size: int = 1 << 20
+) -> Tuple[int, int]:
+    """Count (sled, toboggan) valid passwords with a process pool.
+
+    The file is cut into line-aligned byte ranges, a few per worker, and each
+    worker reads its range chunk_size bytes at a time.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from os import cpu_count
+
+    path = f"data/{filename}"
+    workers = workers or cpu_count()
+    ranges = byte_ranges(path, workers * 4)
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(validate_range, path, start, end, chunk_size)
+            for start, end in ranges
+        ]
+        counts = [future.result() for future in futures]
+
+    return sum(sled for sled, _ in counts), sum(toboggan for _, toboggan in counts)
+
+
+def part1(data) -> int:
+    if not isinstance(data, Policies):
+        data = parse_policies(data)
+
+    return count_sled_valid(data)
+
+
+if __name__ == "__main__":
+    print(solution("day02", part1, policy_parser))
+
+# ----------- TEST
+test1 = """
+1-3 a: abcde
+1-3 b: cdefg
+2-9 c: ccccccccc
+"""
+
+
+def test_answer():
+    assert part1(test1.strip().splitlines()) == 2
+    assert part2(policy_parser(test1.lstrip())) == 1
+
+
+def test_policies():
+    import pytest
+
+    # The letter at one position and a position past the end is still valid
+    policies = policy_parser("1-9 c: cd\n2-9 c: cd\n4-5 c: cd\n")
+    assert count_toboggan_valid(policies) == 1
+    assert count_sled_valid(policies) == 1
+
+    for line in ("1-3 a:abc", "1-3 a: abc def", "1-3 a: ", ""):
+        with pytest.raises(ValueError, match="malformed"):
+            policy_parser(f"1-3 a: abcde\n{line}\n2-9 c: ccccccccc\n")
+
+
+def test_validate_parallel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    text = test1.lstrip() * 20 + "1-9 c: cd\n"
+    (tmp_path / "data" / "passwords").write_text(text)
+
+    # Small chunks make lines straddle read boundaries inside each range
+    expected = (part1(policy_parser(text)), part2(policy_parser(text)))
+    for workers, chunk_size in ((1, 1 << 20), (3, 16)):
+        assert validate_parallel("passwords", workers, chunk_size) == expected
 
 
 # --- Part Two ---
@@ -71,23 +210,12 @@ print(solution("day02", part1, line_parser))
 # How many passwords are valid according to the new interpretation of the policies?
 
 
-def part2(data):
-    valid = 0
+def part2(data) -> int:
+    if not isinstance(data, Policies):
+        data = parse_policies(data)
 
-    for line in data:
-        d = line.split()
-        policy, letter, password = d[0], d[1][:-1], d[2]
-
-        minimum = int(policy.split("-")[0]) - 1
-        maximum = int(policy.split("-")[1]) - 1
-
-        if password[minimum] == letter and password[maximum] != letter:
-            valid += 1
-
-        elif password[maximum] == letter and password[minimum] != letter:
-            valid += 1
-
-    return valid
+    return count_toboggan_valid(data)
 
 
-print(solution("day02", part2, line_parser))
+if __name__ == "__main__":
+    print(solution("day02", part2, policy_parser))
@@ -1,4 +1,5 @@
 from common.util import *
+from collections import namedtuple
 from typing import List, Tuple
 
 # --- Day 3: Toboggan Trajectory ---
@@ -60,19 +61,159 @@ from typing import List, Tuple
 # Starting at the top-left corner of your map and following a slope of right 3 and down 1, how many trees would you encounter?
 
 
-def part1(data: List[str], right: int, down: int) -> int:
-    count = 0
-    for idx, line in enumerate(data[down::down]):
-        ptr = ((idx + 1) * right) % len(line)
+# Each row is an int whose bit x is set when column x holds a tree; text
+# keeps the rows as they were read, end to end, for strided counting
+TreeMap = namedtuple("TreeMap", ["rows", "width", "text"])
 
-        if line[ptr] == "#":
-            count += 1
+TREE_BITS = str.maketrans("#.", "10")
 
-    return count
 
+def parse_tree_map(lines: List[str]) -> TreeMap:
+    lines = [line for line in lines if line]
+    rows = [int(line[::-1].translate(TREE_BITS), 2) for line in lines]
+    width = len(lines[0]) if rows else 1
 
-data = get_data("day03", line_parser)
-print(part1(data, 3, 1))
+    return TreeMap(rows, width, "".join(lines))
+
+
+def tree_map_parser(data: str) -> TreeMap:
+    return parse_tree_map(data.splitlines())
+
+
+def count_trees(tree_map: TreeMap, slopes: List[Tuple[int, int]]) -> List[int]:
+    """Trees hit on each (right, down) slope.
+
+    Steps that agree modulo the width land in the same column, so each
+    (step residue, column) tally is a single strided slice of the map text.
+    Tallies are shared between slopes, and a slope costs at most width
+    lookups however many rows the map has.
+    """
+    rows, width, text = tree_map
+    tallies = {}
+    counts = []
+
+    for right, down in slopes:
+        row_chars = width * down
+        steps = (len(rows) - 1) // down
+        total = 0
+
+        # Row 0 is the starting square and never counted, so the residue
+        # classes run from step 1 to step width
+        for first in range(1, min(width, steps) + 1):
+            key = (down, first, first * right % width)
+            if key not in tallies:
+                start = first * row_chars + key[2]
+                tallies[key] = text[start :: width * row_chars].count("#")
+            total += tallies[key]
+
+        counts.append(total)
+
+    return counts
+
+
+def tree_matrix(tree_map: TreeMap):
+    """Unpack the row bitmasks into a (rows, width) NumPy bool matrix."""
+    import numpy as np
+
+    rows, width, _ = tree_map
+    nbytes = (width + 7) // 8
+    packed = b"".join(row.to_bytes(nbytes, "little") for row in rows)
+    bits = np.frombuffer(packed, dtype=np.uint8).reshape(len(rows), nbytes)
+
+    return np.unpackbits(bits, axis=1, bitorder="little")[:, :width].astype(bool)
+
+
+def find_slopes(
+    tree_map: TreeMap, max_right: int, max_down: int, limit: int = 10, block: int = 4096
+) -> List[Tuple[int, Tuple[int, int]]]:
+    """Rank slopes within 1..max_right by 1..max_down by fewest trees hit.
+
+    Every right step for a given down step is evaluated at once, a block of
+    rows at a time. Once limit slopes are complete, any slope whose partial
+    count already exceeds the worst of them is dropped.
+    """
+    import numpy as np
+
+    trees = tree_matrix(tree_map)
+    width = tree_map.width
+    ranked = []
+
+    # Rights equal modulo the width hit the same squares, so only one right
+    # per residue is evaluated
+    all_rights = np.arange(1, max_right + 1)
+
+    # Steep slopes visit fewer rows, so they finish first and set the bar
+    for down in range(max_down, 0, -1):
+        residues = np.unique(all_rights % width)
+        counts = np.zeros(len(residues), dtype=np.int64)
+        ys = np.arange(down, len(trees), down)
+
+        for start in range(0, len(ys), block):
+            rows = ys[start : start + block]
+            steps = np.arange(start + 1, start + 1 + len(rows))
+            cols = steps[:, None] * residues[None, :] % width
+            counts += trees[rows[:, None], cols].sum(axis=0)
+
+            if len(ranked) >= limit:
+                keep = counts <= ranked[limit - 1][0]
+                residues, counts = residues[keep], counts[keep]
+                if not len(residues):
+                    break
+
+        totals = dict(zip(residues.tolist(), counts.tolist()))
+        ranked.extend(
+            (totals[right % width], (right, down))
+            for right in range(1, max_right + 1)
+            if right % width in totals
+        )
+        ranked.sort()
+        del ranked[limit:]
+
+    return ranked
+
+
+def part1(data, right: int, down: int) -> int:
+    if not isinstance(data, TreeMap):
+        data = parse_tree_map(data)
+
+    return count_trees(data, [(right, down)])[0]
+
+
+if __name__ == "__main__":
+    data = get_data("day03", tree_map_parser)
+    print(part1(data, 3, 1))
+
+# ----------- TEST
+test1 = """
+..##.......
+#...#...#..
+.#....#..#.
+..#.#...#.#
+.#...##..#.
+..#.##.....
+.#.#.#....#
+.#........#
+#.##...#...
+#...##....#
+.#..#...#.#
+"""
+
+
+def test_count_trees():
+    tree_map = tree_map_parser(test1.strip())
+    slopes = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+    assert count_trees(tree_map, slopes) == [2, 7, 3, 4, 2]
+    assert count_trees(tree_map, [(3 + 11, 1), (0, 1), (1, 20)]) == [7, 3, 0]
+
+
+def test_find_slopes():
+    tree_map = tree_map_parser(test1.strip())
+    slopes = [(right, down) for right in range(1, 30) for down in range(1, 5)]
+    ranked = sorted(zip(count_trees(tree_map, slopes), slopes))
+
+    # A block of two rows prunes slopes partway through each down group
+    for limit in (1, 5, 40):
+        assert find_slopes(tree_map, 29, 4, limit, block=2) == ranked[:limit]
 
 
 # --- Part Two ---
@@ -90,14 +231,18 @@ print(part1(data, 3, 1))
 # What do you get if you multiply together the number of trees encountered on each of the listed slopes?
 
 
-def part2(data: List[str], slopes: List[Tuple[int, int]]) -> int:
+def part2(data, slopes: List[Tuple[int, int]]) -> int:
+    if not isinstance(data, TreeMap):
+        data = parse_tree_map(data)
+
     multiplied = 1
-    for slope in slopes:
-        multiplied *= part1(data, slope[0], slope[1])
+    for count in count_trees(data, slopes):
+        multiplied *= count
 
     return multiplied
 
 
-data = get_data("day03", line_parser)
-slope_list = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
-print(part2(data, slope_list))
+if __name__ == "__main__":
+    data = get_data("day03", tree_map_parser)
+    slope_list = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+    print(part2(data, slope_list))
@@ -1,5 +1,8 @@
 from common.util import *
-from typing import List
+from array import array
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Tuple
+import re
 
 # --- Day 4: Passport Processing ---
 # You arrive at the airport only to realize that you grabbed your North Pole Credentials instead of your passport.
@@ -52,31 +55,21 @@ from typing import List
 # Count the number of valid passports - those that have all required fields. Treat cid as optional. In your batch file, how many passports are valid?
 
 
-def part1(data):
+def part1(data: Iterable[str]) -> int:
     valids = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
 
-    count, passports, line = 0, [], set()
+    count = 0
 
-    # Parse passports
-    for i, item in enumerate(data):
-
-        if item != "":
-            for attrs in item.split(" "):
-                line.add(attrs[:3])
-
-        if i == len(data) - 1 or item == "":
-            passports.append(line)
-            line = set()
-
-    # Check valid passport
-    for passport in passports:
+    for record in data:
+        passport = {field[:3] for field in record.split()}
         if all(v in passport for v in valids):
             count += 1
 
     return count
 
 
-print(solution("day04", part1, line_parser))
+if __name__ == "__main__":
+    print(solution("day04", part1, record_stream, stream=True))
 
 
 # --- Part Two ---
@@ -147,55 +140,347 @@ print(solution("day04", part1, line_parser))
 # Continue to treat cid as optional. In your batch file, how many passports are valid?
 
 
-def part2(data):
-    valids = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
+# Each field maps to (kind, *params); PassportValidator compiles them once
+PASSPORT_RULES = {
+    "byr": ("range", 1920, 2002, 4),
+    "iyr": ("range", 2010, 2020, 4),
+    "eyr": ("range", 2020, 2030, 4),
+    "hgt": ("units", {"cm": (150, 193), "in": (59, 76)}),
+    "hcl": ("regex", r"#[0-9a-f]{6}"),
+    "ecl": ("enum", ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]),
+    "pid": ("regex", r"[0-9]{9}"),
+}
 
-    count, passports, passport = 0, [], dict()
-
-    # Parse passports
-    for i, item in enumerate(data):
-
-        if item != "":
-            for field in item.split(" "):
-                passport[field[:3]] = field[4:]
-
-        if i == len(data) - 1 or item == "":
-            passports.append(passport)
-            passport = dict()
-
-    # Check valid passport
-    for passport in passports:
-        # byr (Birth Year) - four digits; at least 1920 and at most 2002.
-        # iyr (Issue Year) - four digits; at least 2010 and at most 2020.
-        # eyr (Expiration Year) - four digits; at least 2020 and at most 2030.
-        # hgt (Height) - a number followed by either cm or in:
-        # If cm, the number must be at least 150 and at most 193.
-        # If in, the number must be at least 59 and at most 76.
-        # hcl (Hair Color) - a # followed by exactly six characters 0-9 or a-f.
-        # ecl (Eye Color) - exactly one of: amb blu brn gry grn hzl oth.
-        # pid (Passport ID) - a nine-digit number, including leading zeroes.
-        if all(v in passport for v in valids):
-            byr = 1920 <= int(passport["byr"]) <= 2002
-            iyr = 2010 <= int(passport["iyr"]) <= 2020
-            eyr = 2020 <= int(passport["eyr"]) <= 2030
-
-            hgt_unit, hgt_value = passport["hgt"][-2:], passport["hgt"][:-2]
-            if hgt_unit == "cm":
-                hgt = 150 <= int(hgt_value) <= 193
-            elif hgt_unit == "in":
-                hgt = 59 <= int(hgt_value) <= 76
+# Relative cost of each rule kind, used to order checks before any stats exist
+RULE_COSTS = {"enum": 1, "range": 2, "units": 3, "regex": 4}
+
+
+def is_number(value: str) -> bool:
+    # str.isdigit also accepts superscripts and non-Latin digits
+    return value.isascii() and value.isdigit()
+
+
+def compile_rule(kind: str, *params) -> Callable[[str], bool]:
+    if kind == "enum":
+        return frozenset(params[0]).__contains__
+
+    if kind == "range":
+        low, high, digits = (params + (None,))[:3]
+
+        def check(value):
+            if not is_number(value) or (digits and len(value) != digits):
+                return False
+            return low <= int(value) <= high
+
+        return check
+
+    if kind == "units":
+        units = [(unit, low, high) for unit, (low, high) in params[0].items()]
+
+        def check(value):
+            for unit, low, high in units:
+                if value.endswith(unit):
+                    number = value[: -len(unit)]
+                    return is_number(number) and low <= int(number) <= high
+            return False
+
+        return check
+
+    if kind == "regex":
+        match = re.compile(params[0]).fullmatch
+        return lambda value: match(value) is not None
+
+    raise ValueError(f"unknown rule kind {kind!r}")
+
+
+def load_rules(path: str) -> dict:
+    """Read a rule schema like PASSPORT_RULES from a JSON object of lists."""
+    import json
+
+    with open(path) as f:
+        return {field: tuple(spec) for field, spec in json.load(f).items()}
+
+
+class PassportValidator:
+    """Validate passport dicts against compiled rules, stopping at the first
+    failure. Checks are re-sorted every reorder_every passports so the ones
+    rejecting most per unit of cost run first.
+    """
+
+    def __init__(self, rules: dict = PASSPORT_RULES, reorder_every: int = 1024):
+        self.costs = {field: RULE_COSTS[spec[0]] for field, spec in rules.items()}
+        self.rules = {field: compile_rule(*spec) for field, spec in rules.items()}
+        self.order = sorted(self.rules.items(), key=lambda rule: self.costs[rule[0]])
+        self.reorder_every = reorder_every
+
+        self.passports = 0
+        self.checked = dict.fromkeys(self.rules, 0)
+        self.rejected = dict.fromkeys(self.rules, 0)
+
+    def __call__(self, passport: dict) -> bool:
+        self.passports += 1
+        if self.passports % self.reorder_every == 0:
+            self.reorder()
+
+        checked, rejected = self.checked, self.rejected
+        for field, check in self.order:
+            checked[field] += 1
+            value = passport.get(field)
+            if value is None or not check(value):
+                rejected[field] += 1
+                return False
+
+        return True
+
+    def reorder(self):
+        def score(rule):
+            field = rule[0]
+            rate = self.rejected[field] / (self.checked[field] or 1)
+            return -rate / self.costs[field]
+
+        self.order.sort(key=score)
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """(checked, rejected) counts per field."""
+        return {
+            field: (self.checked[field], self.rejected[field]) for field in self.rules
+        }
+
+
+# Columnar batches: one NumPy string array per field ("" where absent) and
+# a presence bitmask per passport, bit i set when FIELDS[i] was given.
+FIELDS = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
+FIELD_BITS = {field: 1 << i for i, field in enumerate(FIELDS)}
+
+PassportBatch = namedtuple("PassportBatch", ["presence", "columns"])
+
+
+def passport_batch(records: Iterable[str]):
+    import numpy as np
+
+    # Each column is filled sparsely from the fields a record actually has,
+    # then scattered into place once all records are read
+    presence = array("H")
+    indices = {field: array("i") for field in FIELDS}
+    values = {field: [] for field in FIELDS}
+
+    for index, record in enumerate(records):
+        mask = 0
+        for item in record.split():
+            field = item[:3]
+            bit = FIELD_BITS.get(field)
+            if bit is None:
+                continue
+
+            if mask & bit:
+                # A repeated field overrides the earlier one
+                values[field][-1] = item[4:]
             else:
-                hgt = False
+                mask |= bit
+                indices[field].append(index)
+                values[field].append(item[4:])
+        presence.append(mask)
+
+    columns = {}
+    for field in FIELDS:
+        given = np.array(values[field], dtype=str)
+        columns[field] = np.zeros(len(presence), dtype=given.dtype)
+        columns[field][np.frombuffer(indices[field], dtype=np.int32)] = given
+
+    return PassportBatch(np.frombuffer(presence, dtype=np.uint16), columns)
+
+
+def count_complete(batch: PassportBatch, fields: Iterable[str] = FIELDS[:-1]) -> int:
+    required = sum(FIELD_BITS[field] for field in fields)
+    return int(((batch.presence & required) == required).sum())
+
+
+def column_numbers(column, digits=None):
+    """(valid, numbers) for a string column holding plain unsigned integers."""
+    import numpy as np
+
+    # Compare code points directly, as np.char.isdigit accepts any Unicode
+    # digit and astype(np.int64) then fails on superscripts
+    lengths = np.char.str_len(column)
+    width = column.dtype.itemsize // 4
+    codes = np.ascontiguousarray(column).view(np.uint32).reshape(len(column), width)
+    ascii_digits = ((codes >= 48) & (codes <= 57)).sum(axis=1)
+    # Longer numbers would overflow int64, and no rule needs them
+    valid = (lengths > 0) & (lengths <= 18) & (ascii_digits == lengths)
+    if digits:
+        valid &= lengths == digits
 
-            hcl = passport["hcl"][0] == "#" and passport["hcl"][1:].isalnum()
-            ecl = any(
-                v in passport["ecl"]
-                for v in ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]
-            )
-            pid = len(passport["pid"]) == 9 and passport["pid"].isnumeric()
-            count += all([byr, iyr, eyr, hgt, hcl, ecl, pid])
+    # Empty and malformed entries parse as 0 but are masked out by valid
+    return valid, np.where(valid, column, "0").astype(np.int64)
+
+
+def check_column(column, kind: str, *params):
+    import numpy as np
+
+    if kind == "enum":
+        return np.isin(column, list(params[0]))
+
+    if kind == "range":
+        low, high, digits = (params + (None,))[:3]
+        valid, numbers = column_numbers(column, digits)
+        return valid & (low <= numbers) & (numbers <= high)
+
+    if kind == "units":
+        result = np.zeros(len(column), dtype=bool)
+        lengths = np.char.str_len(column)
+        for unit, (low, high) in params[0].items():
+            has_unit = np.char.endswith(column, unit)
+            # Stripping the unit's characters may eat more than the suffix;
+            # the length check below rejects those values
+            prefix = np.where(has_unit, np.char.rstrip(column, unit), "")
+            valid, numbers = column_numbers(prefix)
+            valid &= np.char.str_len(prefix) == lengths - len(unit)
+            result |= has_unit & valid & (low <= numbers) & (numbers <= high)
+        return result
+
+    if kind == "regex":
+        match = re.compile(params[0]).fullmatch
+        return np.fromiter((match(v) is not None for v in column), bool, len(column))
+
+    raise ValueError(f"unknown rule kind {kind!r}")
+
+
+def count_valid(batch: PassportBatch, rules: dict = PASSPORT_RULES) -> int:
+    valid = None
+    for field, spec in rules.items():
+        present = (batch.presence & FIELD_BITS[field]) != 0
+        checked = present & check_column(batch.columns[field], *spec)
+        valid = checked if valid is None else valid & checked
+
+    return int(valid.sum()) if valid is not None else len(batch.presence)
+
+
+def scan_range(path: str, start: int, end: int, chunk_size: int):
+    validator = PassportValidator()
+    complete = valid = 0
+
+    for chunk in range_chunks(path, start, end, chunk_size, b"\n\n"):
+        for record in record_parser(chunk):
+            passport = {field[:3]: field[4:] for field in record.split()}
+            complete += all(field in passport for field in PASSPORT_RULES)
+            valid += validator(passport)
+
+    return complete, valid, validator.stats()
+
+
+def scan_parallel(filename: str, workers: int = None, chunk_size: int = 1 << 20):
+    """Count (complete, valid, per-field stats) over a process pool.
+
+    The batch file is cut at blank lines into a few byte ranges per worker,
+    so no passport straddles two workers.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from os import cpu_count
+
+    path = f"data/{filename}"
+    workers = workers or cpu_count()
+    ranges = byte_ranges(path, workers * 4, b"\n\n")
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(scan_range, path, start, end, chunk_size)
+            for start, end in ranges
+        ]
+        results = [future.result() for future in futures]
+
+    complete = sum(result[0] for result in results)
+    valid = sum(result[1] for result in results)
+    stats = {field: (0, 0) for field in PASSPORT_RULES}
+    for _, _, worker_stats in results:
+        for field, (checked, rejected) in worker_stats.items():
+            stats[field] = (stats[field][0] + checked, stats[field][1] + rejected)
+
+    return complete, valid, stats
+
+
+def part2(data: Iterable[str], validator: PassportValidator = None) -> int:
+    validator = validator or PassportValidator()
+    count = 0
+
+    for record in data:
+        passport = {field[:3]: field[4:] for field in record.split()}
+        count += validator(passport)
 
     return count
 
 
-print(solution("day04", part2, line_parser))
+if __name__ == "__main__":
+    print(solution("day04", part2, record_stream, stream=True))
+
+# ----------- TEST
+test1 = """
+eyr:1972 cid:100
+hcl:#18171d ecl:amb hgt:170 pid:186cm iyr:2018 byr:1926
+
+iyr:2019
+hcl:#602927 eyr:1967 hgt:170cm
+ecl:grn pid:012533040 byr:1946
+
+hcl:dab227 iyr:2012
+ecl:brn hgt:182cm pid:021572410 eyr:2020 byr:1992 cid:277
+
+hgt:59cm ecl:zzz
+eyr:2038 hcl:74454a iyr:2023
+pid:3556412378 byr:2007
+
+pid:087499704 hgt:74in ecl:grn iyr:2012 eyr:2030 byr:1980
+hcl:#623a2f
+
+eyr:2029 ecl:blu cid:129 byr:1989
+iyr:2014 pid:896056539 hcl:#a97842 hgt:165cm
+
+hcl:#888785
+hgt:164cm byr:2001 iyr:2015 cid:88
+pid:545766238 ecl:hzl
+eyr:2022
+
+iyr:2010 hgt:158cm hcl:#b6652a ecl:blu byr:1944 eyr:2021 pid:093154719
+
+byr:19²0 iyr:2010 hgt:158cm hcl:#b6652a ecl:blu eyr:2021 pid:093154719
+
+byr:١٩٤٤ iyr:2010 hgt:1⁵8cm hcl:#b6652a ecl:blu eyr:2021 pid:093154719
+"""
+
+
+def test_answer():
+    assert part1(record_parser(test1)) == 10
+    assert part2(record_parser(test1)) == 4
+
+
+def test_count_valid():
+    batch = passport_batch(record_parser(test1))
+    assert count_complete(batch) == 10
+    assert count_valid(batch) == 4
+    assert count_valid(batch, {}) == 10
+
+    huge = "byr:1980 iyr:2012 eyr:2030 hgt:99999999999999999999999cm"
+    huge += " hcl:#623a2f ecl:grn pid:087499704"
+    assert count_valid(passport_batch([huge])) == part2([huge]) == 0
+    assert count_valid(passport_batch([huge.replace("9999" * 5 + "999", "170")])) == 1
+
+    # Each column rule agrees with the compiled rule it mirrors
+    for field, spec in PASSPORT_RULES.items():
+        check = compile_rule(*spec)
+        values = batch.columns[field]
+        expected = [value != "" and check(value) for value in values]
+        assert check_column(values, *spec).tolist() == expected
+
+
+def test_scan_parallel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "passports").write_text(test1.strip() + "\n")
+
+    validator = PassportValidator()
+    assert part2(record_parser(test1), validator) == 4
+
+    # Small chunks make records straddle read boundaries inside each range
+    for workers, chunk_size in ((1, 1 << 20), (3, 64)):
+        complete, valid, stats = scan_parallel("passports", workers, chunk_size)
+        assert (complete, valid) == (10, 4)
+        assert stats == validator.stats()
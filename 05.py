@@ -1,5 +1,7 @@
 from common.util import *
-from typing import List
+from array import array
+import operator
+from typing import Iterable, List
 
 # --- Day 5: Binary Boarding ---
 # You board your plane only to discover a new problem: you dropped your boarding pass!
@@ -47,34 +49,110 @@ from typing import List
 # As a sanity check, look through your list of boarding passes. What is the highest seat ID on a boarding pass?
 
 
-def reduce_binary(codes: List[str], lower_char: str, upper_limit: int) -> int:
-    l, r = 0, upper_limit - 1
+# A boarding pass is a binary number: B and R are 1 bits, F and L are 0 bits
+SEAT_BITS = str.maketrans("FBLR", "0101")
 
-    for code in codes[:-1]:
-        mid = (l + r) // 2
-        if code == lower_char:
-            r = mid
-        else:
-            l = mid + 1
 
-    return l if codes[-1] == lower_char else r
+def seat_id(code: str, num_cols: int = 8) -> int:
+    bits = int(code.translate(SEAT_BITS), 2)
+    if num_cols & (num_cols - 1) == 0:
+        return bits
 
+    # Non power of two widths still spend a whole number of bits on columns
+    col_bits = (num_cols - 1).bit_length()
+    return (bits >> col_bits) * num_cols + (bits & ((1 << col_bits) - 1))
 
-def part1(data: List[str], num_rows: int, num_cols: int) -> int:
-    max_seat_id = 0
 
-    for line in data:
-        row = reduce_binary(line[:7], "F", num_rows)
-        col = reduce_binary(line[7:], "L", num_cols)
+def seat_array(ids: Iterable[int]) -> array:
+    ids = list(ids)
+    return array("H" if max(ids, default=0) < 1 << 16 else "I", ids)
 
-        seat_id = row * 8 + col
-        max_seat_id = max(seat_id, max_seat_id)
 
-    return max_seat_id
+def decode_passes(data: str, num_cols: int = 8) -> array:
+    """Decode a whole file of passes with one translate over the text."""
+    if num_cols & (num_cols - 1) == 0:
+        codes = data.translate(SEAT_BITS).split()
+        return seat_array(int(code, 2) for code in codes)
 
+    return seat_array(seat_id(code, num_cols) for code in data.split())
 
-data = get_data("day05", line_parser)
-print(part1(data, 128, 8))
+
+def decode_pass_buffer(buf, num_cols: int = 8):
+    """Decode fixed-width passes from a bytes buffer into a NumPy array."""
+    import numpy as np
+
+    chars = np.frombuffer(buf, dtype=np.uint8)
+    stride = buf.find(b"\n") + 1 or len(chars) + 1
+    newline = b"\r\n" if stride > 1 and buf[stride - 2] == 13 else b"\n"
+    newline = np.frombuffer(newline, dtype=np.uint8)
+    width = stride - len(newline)
+
+    # Pad a missing final newline so every pass takes stride bytes
+    if len(chars) % stride:
+        chars = np.append(chars, newline)
+    if len(chars) % stride:
+        raise ValueError(f"boarding passes are not all {width} characters long")
+
+    # A stray \r or short line puts control characters in a pass column
+    rows = chars.reshape(-1, stride)
+    if np.any(rows[:, width:] != newline) or np.any(rows[:, :width] < ord("A")):
+        raise ValueError(f"boarding passes are not all {width} characters long")
+
+    # B and R are the only pass letters with bit 2 clear, so each column
+    # shifts in ~char >> 2 & 1
+    ids = np.zeros(len(rows), dtype=np.uint16 if width <= 16 else np.uint64)
+    for col in range(width):
+        ids = (ids << 1) | (~rows[:, col] >> 2 & 1)
+
+    if num_cols & (num_cols - 1):
+        col_bits = (num_cols - 1).bit_length()
+        ids = ids.astype(np.int64)
+        ids = (ids >> col_bits) * num_cols + (ids & ((1 << col_bits) - 1))
+
+    return ids
+
+
+def to_seat_ids(data, num_cols: int):
+    if isinstance(data, array) or hasattr(data, "dtype"):
+        return data
+    return seat_array(seat_id(line, num_cols) for line in data)
+
+
+def part1(data, num_rows: int, num_cols: int) -> int:
+    return int(max(to_seat_ids(data, num_cols), default=0))
+
+
+if __name__ == "__main__":
+    data = get_data("day05", decode_passes)
+    print(part1(data, 128, 8))
+
+# ----------- TEST
+test1 = """
+FBFBBFFRLR
+BFFFBBFRRR
+FFFBBBFRRR
+BBFFBBFRLL
+"""
+
+
+def test_answer():
+    assert part1(test1.split(), 128, 8) == 820
+    assert part1([], 128, 8) == 0
+    rows_cols = [(44, 5), (70, 7), (14, 7), (102, 4)]
+    assert list(decode_passes(test1, 6)) == [row * 6 + col for row, col in rows_cols]
+
+
+def test_decode_pass_buffer():
+    import pytest
+
+    ids = [357, 567, 119, 820]
+    for newline in ("\n", "\r\n"):
+        text = test1.strip().replace("\n", newline)
+        assert decode_pass_buffer((text + newline).encode()).tolist() == ids
+        assert decode_pass_buffer(text.encode()).tolist() == ids
+
+    with pytest.raises(ValueError):
+        decode_pass_buffer(b"FBFBBFFRLR\nFBFBBFFRL\r\n")
 
 
 # --- Part Two ---
@@ -88,22 +166,117 @@ print(part1(data, 128, 8))
 # What is the ID of your seat?
 
 
-def part2(data: List[str], num_rows: int, num_cols: int) -> int:
-    min_seat_id, max_seat_id = float("inf"), float("-inf")
-    seat_ids = set()
-
-    for line in data:
-        row = reduce_binary(line[:7], "F", num_rows)
-        col = reduce_binary(line[7:], "L", num_cols)
-
-        seat_id = row * 8 + col
-        max_seat_id = max(seat_id, max_seat_id)
-        min_seat_id = min(seat_id, min_seat_id)
-
-        seat_ids.add(seat_id)
+def set_bits(bits: int) -> List[int]:
+    seats = []
+    while bits:
+        low = bits & -bits
+        seats.append(low.bit_length() - 1)
+        bits ^= low
+    return seats
 
-    return set(range(min_seat_id, max_seat_id)) - seat_ids
 
+class SeatIndex:
+    """Occupancy bitmap for one aircraft layout, bit n set when seat n is taken.
 
-data = get_data("day05", line_parser)
-print(part2(data, 128, 8))
+    Updates touch a single 64-bit word; queries turn the words into one int
+    and answer with shifts and masks over the whole plane at once.
+    """
+
+    def __init__(self, num_rows: int = 128, num_cols: int = 8):
+        self.num_rows, self.num_cols = num_rows, num_cols
+        self.size = num_rows * num_cols
+        self.words = array("Q", bytes(8 * ((self.size + 63) // 64)))
+        self.count = 0
+
+    def __contains__(self, seat: int) -> bool:
+        # NumPy ints keep their width, so 1 << seat would overflow them
+        seat = operator.index(seat)
+        return bool(self.words[seat >> 6] >> (seat & 63) & 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, seat: int):
+        seat = operator.index(seat)
+        if not 0 <= seat < self.size:
+            raise ValueError(f"seat {seat} outside {self.num_rows}x{self.num_cols}")
+        if seat not in self:
+            self.words[seat >> 6] |= 1 << (seat & 63)
+            self.count += 1
+
+    def remove(self, seat: int):
+        seat = operator.index(seat)
+        if 0 <= seat < self.size and seat in self:
+            self.words[seat >> 6] ^= 1 << (seat & 63)
+            self.count -= 1
+
+    def update(self, seats: Iterable[int]):
+        # Arrays convert to Python ints in one call rather than per item
+        if hasattr(seats, "tolist"):
+            seats = seats.tolist()
+        for seat in seats:
+            self.add(seat)
+
+    def bitmap(self) -> int:
+        return int.from_bytes(self.words.tobytes(), "little")
+
+    def missing(self) -> List[int]:
+        """Free seats between the lowest and highest taken seat."""
+        taken = self.bitmap()
+        if not taken:
+            return []
+
+        low, high = (taken & -taken).bit_length() - 1, taken.bit_length() - 1
+        if high - low < 2:
+            return []
+
+        span = (1 << high) - (1 << (low + 1))
+        return set_bits(~taken & span)
+
+    def sandwiched(self) -> List[int]:
+        """Free seats whose ids either side are both taken."""
+        taken = self.bitmap()
+        return set_bits(~taken & (taken << 1) & (taken >> 1) & ((1 << self.size) - 1))
+
+    def free_blocks(self, length: int) -> List[int]:
+        """First seat of every run of length free seats within one row."""
+        if not 0 < length <= self.num_cols:
+            return []
+
+        free = ~self.bitmap() & ((1 << self.size) - 1)
+        for _ in range(1, length):
+            free &= free >> 1
+
+        # Repeat the allowed start columns of one row across every row
+        row_starts = (1 << (self.num_cols - length + 1)) - 1
+        rows = ((1 << self.size) - 1) // ((1 << self.num_cols) - 1)
+        return set_bits(free & row_starts * rows)
+
+
+def part2(data, num_rows: int, num_cols: int) -> int:
+    index = SeatIndex(num_rows, num_cols)
+    index.update(to_seat_ids(data, num_cols))
+
+    return set(index.missing())
+
+
+if __name__ == "__main__":
+    data = get_data("day05", decode_passes)
+    print(part2(data, 128, 8))
+
+
+def test_seat_index():
+    import numpy as np
+
+    seats = [seat for seat in range(40, 900) if seat != 517]
+    bits = "".join(f"{seat:010b}\n" for seat in seats)
+    passes = bits.translate(str.maketrans("01", "FB")).encode()
+    assert part2(decode_pass_buffer(passes), 128, 8) == {517}
+
+    # Seats past bit 15 of a word must not wrap in 16-bit NumPy ints
+    index = SeatIndex(128, 8)
+    index.update(np.array([16, 17, 19, 63, 1000], dtype=np.uint16))
+    assert len(index) == 5 and np.uint16(1000) in index
+    assert index.missing() == [18] + list(range(20, 63)) + list(range(64, 1000))
+    index.remove(np.uint16(1000))
+    assert index.missing() == [18] + list(range(20, 63))
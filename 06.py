@@ -1,5 +1,6 @@
 from common.util import *
-from typing import List
+from collections import namedtuple
+from typing import Iterable, List, Tuple
 
 # --- Day 6: Custom Customs ---
 # As your flight approaches the regional airport where you'll switch to a much larger plane,
@@ -49,26 +50,120 @@ from typing import List
 # For each group, count the number of questions to which anyone answered "yes". What is the sum of those counts?
 
 
-def part1(data: List[str]) -> int:
+# Answers are a-z, so each person's yes answers fit in a 26-bit mask
+ALL_QUESTIONS = (1 << 26) - 1
 
-    count = 0
-    questions = set()
 
-    for i, item in enumerate(data):
+def person_mask(answers: str) -> int:
+    mask = 0
+    for char in answers:
+        mask |= 1 << (ord(char) - 97)
+    return mask
 
-        if item != "":
-            for char in item:
-                questions.add(char)
 
-        if i == len(data) - 1 or item == "":
-            count += len(questions)
-            questions = set()
+def group_masks(group: str) -> Tuple[int, int]:
+    """(anyone, everyone) masks for one group's answers."""
+    anyone, everyone = 0, ALL_QUESTIONS
+    for person in group.split():
+        mask = person_mask(person)
+        anyone |= mask
+        everyone &= mask
 
-    return count
+    return anyone, everyone
 
 
-data = get_data("day06", line_parser)
-print(part1(data))
+def question_histograms(data: Iterable[str]) -> Tuple[List[int], List[int]]:
+    """Per question, how many groups had anyone / everyone answer yes."""
+    anyone_counts, everyone_counts = [0] * 26, [0] * 26
+
+    for group in data:
+        anyone, everyone = group_masks(group)
+        for question in range(26):
+            anyone_counts[question] += anyone >> question & 1
+            everyone_counts[question] += everyone >> question & 1
+
+    return anyone_counts, everyone_counts
+
+
+# Batch analytics: every person is a row of a (people x 26) bool matrix and
+# offsets[g] is the first row of group g, so per-group folds are reduceats.
+SurveyBatch = namedtuple("SurveyBatch", ["answers", "offsets"])
+
+SurveyStats = namedtuple(
+    "SurveyStats", ["anyone", "everyone", "yes_rates", "group_sizes", "top_agreed"]
+)
+
+
+def survey_batch(data: str) -> SurveyBatch:
+    import numpy as np
+
+    chars = np.frombuffer(data.encode(), dtype=np.uint8)
+    newlines = chars == ord("\n")
+    lines = np.cumsum(newlines) - newlines
+
+    letters = (chars >= ord("a")) & (chars <= ord("z"))
+    letter_lines = lines[letters]
+
+    # letter_lines is sorted, so a new person starts wherever it changes
+    new_person = np.ones(len(letter_lines), dtype=bool)
+    new_person[1:] = letter_lines[1:] != letter_lines[:-1]
+    people = letter_lines[new_person]
+    person = np.cumsum(new_person) - 1
+
+    answers = np.zeros((len(people), 26), dtype=bool)
+    answers[person, chars[letters] - ord("a")] = True
+
+    # A group starts wherever the previous non-empty line is not adjacent
+    starts = np.ones(len(people), dtype=bool)
+    starts[1:] = np.diff(people) > 1
+
+    return SurveyBatch(answers, np.flatnonzero(starts))
+
+
+def unpack_masks(masks):
+    import numpy as np
+
+    bits = masks.astype("<u4").view(np.uint8).reshape(-1, 4)
+    return np.unpackbits(bits, axis=1, bitorder="little")[:, :26].astype(bool)
+
+
+def survey_stats(batch: SurveyBatch, top_k: int = 5) -> SurveyStats:
+    """Sums for both parts plus per-question and per-group breakdowns.
+
+    yes_rates is the share of people answering each question yes,
+    group_sizes[n] counts groups of n people and top_agreed lists the
+    (question, share of groups where everyone said yes) pairs, best first.
+    """
+    import numpy as np
+
+    answers, offsets = batch
+    if not len(offsets):
+        return SurveyStats(0, 0, [0.0] * 26, [], [])
+
+    # Fold 32-bit packed rows rather than 26 bool columns per group
+    masks = np.packbits(answers, axis=1, bitorder="little").view("<u4")[:, 0]
+    anyone = unpack_masks(np.bitwise_or.reduceat(masks, offsets))
+    everyone = unpack_masks(np.bitwise_and.reduceat(masks, offsets))
+    sizes = np.diff(np.append(offsets, len(answers)))
+
+    agreed = everyone.mean(axis=0)
+    ranked = np.argsort(-agreed, kind="stable")[:top_k]
+
+    return SurveyStats(
+        int(anyone.sum()),
+        int(everyone.sum()),
+        answers.mean(axis=0).tolist(),
+        np.bincount(sizes).tolist(),
+        [(chr(ord("a") + q), float(agreed[q])) for q in ranked],
+    )
+
+
+def part1(data: Iterable[str]) -> int:
+    return sum(group_masks(group)[0].bit_count() for group in data)
+
+
+if __name__ == "__main__":
+    print(solution("day06", part1, record_stream, stream=True))
 
 
 # --- Part Two ---
@@ -106,27 +201,44 @@ print(part1(data))
 # For each group, count the number of questions to which everyone answered "yes". What is the sum of those counts?
 
 
-def part2(data: List[str]) -> int:
-    from functools import reduce
+def part2(data: Iterable[str]) -> int:
+    return sum(group_masks(group)[1].bit_count() for group in data)
+
+
+if __name__ == "__main__":
+    print(solution("day06", part2, record_stream, stream=True))
+
+# ----------- TEST
+test1 = """
+abc
+
+a
+b
+c
+
+ab
+ac
 
-    count = 0
-    questions = []
+a
+a
+a
+a
 
-    for i, item in enumerate(data):
-        temp_set = set()
+b
+"""
 
-        if item != "":
-            for char in item:
-                temp_set.add(char)
-            questions.append(temp_set)
-            temp_set = set()
 
-        if i == len(data) - 1 or item == "":
-            count += len(reduce(lambda a, b: a & b, questions))
-            questions = []
+def test_answer():
+    assert part1(record_parser(test1)) == 11
+    assert part2(record_parser(test1)) == 6
 
-    return count
 
+def test_survey_stats():
+    # Extra blank lines between groups must not start empty groups
+    stats = survey_stats(survey_batch(test1.replace("\n\n", "\n\n\n")), top_k=3)
+    assert (stats.anyone, stats.everyone) == (11, 6)
+    assert stats.group_sizes == [0, 2, 1, 1, 1]
+    assert stats.top_agreed == [("a", 0.6), ("b", 0.4), ("c", 0.2)]
+    assert stats.yes_rates[:4] == [8 / 11, 4 / 11, 3 / 11, 0.0]
 
-data = get_data("day06", line_parser)
-print(part2(data))
+    assert survey_stats(survey_batch("")) == SurveyStats(0, 0, [0.0] * 26, [], [])
@@ -1,5 +1,8 @@
 from common.util import *
-from typing import List
+from array import array
+from collections import deque
+from typing import Iterable, List, Tuple
+import re
 
 # --- Day 7: Handy Haversacks ---
 # You land at the regional airport in time for your next flight.
@@ -37,51 +40,330 @@ from typing import List
 # How many bag colors can eventually contain at least one shiny gold bag? (The list of rules is quite long; make sure you get all of it.)
 
 
-class Bag:
-    def __init__(self, name: str, count: int, bags: List = []):
-        self.name = name
-        self.count = count
-        self.bags = bags
+CONTENTS = re.compile(r"(\d+) (\w+ \w+) bags?")
 
 
-def parse_bags(rules: List[str]) -> dict:
-    res = dict()
+def csr_order(size: int, keys: array) -> Tuple[array, array]:
+    """Counting sort of edge indices by key: (offsets, edge order)."""
+    offsets = array("q", bytes(8 * (size + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for idx in range(size):
+        offsets[idx + 1] += offsets[idx]
+
+    cursor, order = offsets[:-1], array("q", bytes(8 * len(keys)))
+    for edge, key in enumerate(keys):
+        order[cursor[key]] = edge
+        cursor[key] += 1
+
+    return offsets, order
+
+
+class BagGraph:
+    """Bag rules in compressed sparse row form over interned colour ids.
+
+    The bags directly inside bag i are targets[offsets[i]:offsets[i + 1]],
+    with matching counts, and the bags directly holding it are
+    parents[parent_offsets[i]:parent_offsets[i + 1]]. Containment sets and
+    nested totals are memoised.
+
+    Rules changed after parsing are kept in the patched and patched_parents
+    overlays, which take precedence over the arrays.
+    """
+
+    def __init__(self, names: List[str], sources: array, targets: array, counts: array):
+        self.names = names
+        self.ids = {name: bag for bag, name in enumerate(names)}
+
+        self.offsets, order = csr_order(len(names), sources)
+        self.targets = array("i", (targets[edge] for edge in order))
+        self.counts = array("i", (counts[edge] for edge in order))
+
+        self.parent_offsets, order = csr_order(len(names), targets)
+        self.parents = array("i", (sources[edge] for edge in order))
+
+        self.base_size = len(names)
+        self.patched = dict()
+        self.patched_parents = dict()
+
+        self.containers_memo = dict()
+        self.totals = None
+
+    def children(self, bag: int) -> Iterable[Tuple[int, int]]:
+        if bag in self.patched or bag >= self.base_size:
+            return self.patched.get(bag, [])
+
+        start, end = self.offsets[bag], self.offsets[bag + 1]
+        return zip(self.targets[start:end], self.counts[start:end])
+
+    def degree(self, bag: int) -> int:
+        if bag in self.patched or bag >= self.base_size:
+            return len(self.patched.get(bag, []))
+        return self.offsets[bag + 1] - self.offsets[bag]
+
+    def holders(self, bag: int):
+        if bag in self.patched_parents or bag >= self.base_size:
+            return self.patched_parents.get(bag, [])
+        return self.parents[self.parent_offsets[bag] : self.parent_offsets[bag + 1]]
+
+    def intern(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            if self.totals is not None:
+                self.totals.append(None)
+
+        return self.ids[name]
+
+    def set_rule(self, rule: str):
+        """Add or replace the rule for one bag colour."""
+        bag_name, contents = rule.split(" bags contain ")
+        bag = self.intern(bag_name)
+        children = [
+            (self.intern(child_name), int(count))
+            for count, child_name in CONTENTS.findall(contents)
+        ]
+        self.replace_children(bag, children)
+
+    def remove_rule(self, name: str):
+        """Drop a colour's rule; the colour stays known and holds nothing."""
+        if name in self.ids:
+            self.replace_children(self.ids[name], [])
+
+    def replace_children(self, bag: int, children: List[Tuple[int, int]]):
+        old = list(self.children(bag))
+
+        for child, _ in old:
+            self.patch_parents(child).remove(bag)
+        for child, _ in children:
+            self.patch_parents(child).append(bag)
+        self.patched[bag] = children
+
+        # Only bags at or below a touched child gain or lose holders
+        touched = {child for child, _ in old + children}
+        for affected in self.descendants(touched):
+            self.containers_memo.pop(affected, None)
+
+        # Only this bag and the bags holding it change their nested totals
+        if self.totals is not None:
+            self.totals[bag] = None
+            for holder in self.containers(bag):
+                self.totals[holder] = None
+
+    def patch_parents(self, bag: int) -> List[int]:
+        if bag not in self.patched_parents:
+            self.patched_parents[bag] = list(self.holders(bag))
+        return self.patched_parents[bag]
+
+    def descendants(self, bags: Iterable[int]) -> set:
+        seen, queue = set(bags), deque(bags)
+        while queue:
+            for child, _ in self.children(queue.popleft()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+
+        return seen
+
+    def containers(self, bag: int) -> frozenset:
+        """Ids of every bag that eventually holds bag."""
+        if bag in self.containers_memo:
+            return self.containers_memo[bag]
+
+        seen, queue = set(), deque([bag])
+        while queue:
+            for parent in self.holders(queue.popleft()):
+                if parent in seen:
+                    continue
+
+                seen.add(parent)
+                # A memoised parent brings its whole closure with it
+                known = self.containers_memo.get(parent)
+                if known is None:
+                    queue.append(parent)
+                else:
+                    seen |= known
+
+        self.containers_memo[bag] = frozenset(seen)
+        return self.containers_memo[bag]
+
+    def count_containers(self, name: str) -> int:
+        if name not in self.ids:
+            return 0
+        return len(self.containers(self.ids[name]))
+
+    def nested_totals(self) -> List[int]:
+        """Bags inside each bag, with entries cleared by rule updates refilled."""
+        totals = self.base_totals()
+        if None in totals:
+            for bag in range(len(totals)):
+                if totals[bag] is None:
+                    self.fill_totals(bag)
+
+        return totals
+
+    def base_totals(self) -> List[int]:
+        """Totals from one topological pass, filling leaves first; entries
+        cleared since then are None."""
+        if self.totals is not None:
+            return self.totals
+
+        totals = [0] * len(self.names)
+        remaining = [self.degree(bag) for bag in range(len(self.names))]
+        queue = deque(bag for bag, left in enumerate(remaining) if left == 0)
+
+        done = 0
+        while queue:
+            bag = queue.popleft()
+            done += 1
+            totals[bag] = sum(
+                count * (1 + totals[child]) for child, count in self.children(bag)
+            )
+
+            for parent in self.holders(bag):
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    queue.append(parent)
+
+        if done < len(self.names):
+            stuck = next(bag for bag, left in enumerate(remaining) if left)
+            raise ValueError(f"bag rules contain a cycle below {self.names[stuck]!r}")
+
+        self.totals = totals
+        return totals
+
+    def fill_totals(self, bag: int):
+        """Recompute the cleared totals at or below bag, depth first."""
+        totals = self.totals
+        stack, on_path = [(bag, False)], set()
+
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                totals[node] = sum(
+                    count * (1 + totals[child]) for child, count in self.children(node)
+                )
+                on_path.discard(node)
+                continue
+
+            if totals[node] is not None:
+                continue
+            if node in on_path:
+                name = self.names[node]
+                raise ValueError(f"bag rules contain a cycle through {name!r}")
+
+            on_path.add(node)
+            stack.append((node, True))
+            stack.extend(
+                (child, False)
+                for child, _ in self.children(node)
+                if totals[child] is None
+            )
+
+    def total(self, bag: int) -> int:
+        """Nested total for bag, recomputing entries cleared by rule updates."""
+        if self.base_totals()[bag] is None:
+            self.fill_totals(bag)
+        return self.totals[bag]
+
+    def count_inside(self, name: str) -> int:
+        if name not in self.ids:
+            return 0
+        return self.total(self.ids[name])
+
+
+def parse_bag_graph(rules: Iterable[str]) -> BagGraph:
+    names, ids = [], dict()
+    sources, targets, counts = array("i"), array("i"), array("i")
+
+    def intern(name: str) -> int:
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
     for rule in rules:
-        bag_name, children = rule.split(" bags contain ")
+        if not rule:
+            continue
+
+        bag_name, contents = rule.split(" bags contain ")
+        bag = intern(bag_name)
+        for count, child_name in CONTENTS.findall(contents):
+            sources.append(bag)
+            targets.append(intern(child_name))
+            counts.append(int(count))
+
+    return BagGraph(names, sources, targets, counts)
+
+
+def bag_graph_parser(data: str) -> BagGraph:
+    return parse_bag_graph(data.splitlines())
+
+
+def part1(data) -> int:
+    if not isinstance(data, BagGraph):
+        data = parse_bag_graph(data)
+
+    return data.count_containers("shiny gold")
 
-        bags = []
-        for bag in children.split(", "):
-            if "no other" not in bag:
-                bag_list = bag.split()
-                bags.append(Bag(f"{bag_list[1]} {bag_list[2]}", bag_list[0]))
 
-        res[bag_name] = bags
+if __name__ == "__main__":
+    data = get_data("day07", bag_graph_parser)
+    print(part1(data))
 
-    return res
+# ----------- TEST
+test1 = """
+light red bags contain 1 bright white bag, 2 muted yellow bags.
+dark orange bags contain 3 bright white bags, 4 muted yellow bags.
+bright white bags contain 1 shiny gold bag.
+muted yellow bags contain 2 shiny gold bags, 9 faded blue bags.
+shiny gold bags contain 1 dark olive bag, 2 vibrant plum bags.
+dark olive bags contain 3 faded blue bags, 4 dotted black bags.
+vibrant plum bags contain 5 faded blue bags, 6 dotted black bags.
+faded blue bags contain no other bags.
+dotted black bags contain no other bags.
+"""
 
 
-def count_bag(bags: dict, target_bag_name: str) -> int:
-    seen = set()
+def test_answer():
+    graph = bag_graph_parser(test1.strip())
+    assert part1(graph) == 4
+    assert part2(graph) == 32
 
-    stack = [target_bag_name]
-    while stack:
-        target = stack.pop()
-        for bag, child_bags in bags.items():
-            if any(target == child_bag.name for child_bag in child_bags):
-                stack.append(bag)
-                seen.add(bag)
 
-    return len(seen)
+def test_rule_updates():
+    import pytest
 
+    graph = bag_graph_parser(test1.strip())
+    graph.nested_totals()
+    rules = {rule.split(" bags")[0]: rule for rule in test1.strip().split("\n")}
 
-def part1(data: List[str]) -> int:
-    bags = parse_bags(data)
+    def update(name, contents=None):
+        if contents is None:
+            graph.remove_rule(name)
+            rules[name] = f"{name} bags contain no other bags."
+        else:
+            rules[name] = f"{name} bags contain {contents}."
+            graph.set_rule(rules[name])
 
-    return count_bag(bags, "shiny gold")
+        # Every answer must match a graph parsed from scratch
+        fresh = parse_bag_graph(rules.values())
+        totals = dict(zip(graph.names, graph.nested_totals()))
+        assert totals == dict(zip(fresh.names, fresh.nested_totals()))
+        for name in fresh.names:
+            assert graph.count_containers(name) == fresh.count_containers(name)
 
+    update("pale cyan", "2 shiny gold bags")
+    update("dark olive", "1 dotted black bag, 3 wavy teal bags")
+    update("wavy teal", "4 faded blue bags")
+    update("vibrant plum")
+    assert graph.count_inside("shiny gold") == 1 + 16 + 2
 
-data = get_data("day07", line_parser)
-print(part1(data))
+    # A cycle is reported, and clearing it makes the totals usable again
+    graph.set_rule("faded blue bags contain 1 light red bag.")
+    with pytest.raises(ValueError, match="cycle"):
+        graph.count_inside("shiny gold")
+    update("faded blue")
 
 
 # --- Part Two ---
@@ -113,39 +395,13 @@ print(part1(data))
 # How many individual bags are required inside your single shiny gold bag?
 
 
-def count_bags_inside(bags: dict, target_bag_name: str) -> int:
-    from collections import defaultdict
-
-    total_bag_count = 0
-
-    # Count containing bags for each bag
-    counts = defaultdict(int)
-
-    for bag_name in bags:
-        for child_bag in bags[bag_name]:
-            counts[bag_name] += int(child_bag.count)
-
-    # Use multipliers to get total number of containing bags
-    multipliers = defaultdict(lambda: 1)
-    queue = [target_bag_name]
-
-    while queue:
-        target = queue.pop(0)
-        for bag in bags[target]:
-            queue.append(bag.name)
-
-            multipliers[bag.name] = int(bag.count) * multipliers[target]
-
-        total_bag_count += counts[target] * multipliers[target]
-
-    return total_bag_count
-
-
-def part2(data: List[str]) -> int:
-    bags = parse_bags(data)
+def part2(data) -> int:
+    if not isinstance(data, BagGraph):
+        data = parse_bag_graph(data)
 
-    return count_bags_inside(bags, "shiny gold")
+    return data.count_inside("shiny gold")
 
 
-data = get_data("day07", line_parser)
-print(part2(data))
+if __name__ == "__main__":
+    data = get_data("day07", bag_graph_parser)
+    print(part2(data))
@@ -1,5 +1,6 @@
 from common.util import *
-from typing import List, Tuple
+from common.vm import *
+from typing import Tuple
 
 # --- Day 8: Handheld Halting ---
 # Your flight to the major airline hub reaches cruising altitude without incident.
@@ -54,29 +55,50 @@ from typing import List, Tuple
 # Run your copy of the boot code. Immediately before any instruction is executed a second time, what value is in the accumulator?
 
 
-def part1(data: List[str]) -> int:
-    accumulator, ptr = 0, 0
-    called = set()
+def part1(data) -> int:
+    if not isinstance(data, Program):
+        data = decode(data)
 
-    while True:
-        if ptr in called:
-            return accumulator
-        else:
-            called.add(ptr)
+    return run(data).accumulator
 
-        instruction, val = data[ptr].split()
 
-        if instruction == "acc":
-            accumulator += int(val)
-            ptr += 1
-        elif instruction == "nop":
-            ptr += 1
-        elif instruction == "jmp":
-            ptr += int(val)
+if __name__ == "__main__":
+    data = get_data("day08", program_parser)
+    print(part1(data))
 
+# ----------- TEST
+test1 = """
+nop +0
+acc +1
+jmp +4
+acc +3
+jmp -3
+acc -99
+acc +1
+jmp -4
+acc +6
+"""
 
-data = get_data("day08", line_parser)
-print(part1(data))
+
+def test_answer():
+    program = program_parser(test1.strip())
+    assert part1(program) == 5
+    assert part2(program) == 8
+
+
+def test_run():
+    program = program_parser(test1.strip())
+    assert run(program) == Outcome(LOOP, 5, 1, 7)
+    assert run(program, patch=7) == Outcome(HALT, 8, 9, 6)
+    assert run(program, patch=1) == run(program)
+
+    # Without loop detection only the step limit ends the run
+    assert run(program, step_limit=20, detect_loops=False) == Outcome(LIMIT, 16, 2, 20)
+    assert run(program, step_limit=3) == Outcome(LIMIT, 1, 6, 3)
+
+    assert run(decode(["jmp +5"])) == Outcome(FAULT, 0, 5, 1)
+    assert run(decode(["nop +0", "jmp -2"])) == Outcome(FAULT, 0, -1, 2)
+    assert run(decode([])) == Outcome(HALT, 0, 0, 0)
 
 
 # --- Part Two ---
@@ -120,44 +142,25 @@ print(part1(data))
 # What is the value of the accumulator after the program terminates?
 
 
-def is_terminating(data: List[str]) -> Tuple[bool, int]:
-    accumulator, ptr = 0, 0
-    called = set()
-
-    while True:
-        if ptr in called:
-            return (False, accumulator)
-        else:
-            called.add(ptr)
-
-        instruction, val = data[ptr].split()
-
-        if instruction == "acc":
-            accumulator += int(val)
-            ptr += 1
-        elif instruction == "nop":
-            ptr += 1
-        elif instruction == "jmp":
-            ptr += int(val)
+def is_terminating(data: Program, patch: int = None) -> Tuple[bool, int]:
+    outcome = run(data, patch)
+    return (outcome.status == HALT, outcome.accumulator)
 
-        if ptr == len(data):
-            return (True, accumulator)
 
+def part2(data) -> int:
+    if not isinstance(data, Program):
+        data = decode(data)
 
-def part2(data: List[str]) -> int:
-    for i in range(len(data)):
-        copied_data = data[:]
-        instruction, val = data[i].split()
-        if instruction == "nop":
-            copied_data[i] = f"jmp {val}"
-        elif instruction == "jmp":
-            copied_data[i] = f"nop {val}"
+    for i, op in enumerate(data.ops):
+        if op == ACC:
+            continue
 
-        check, acc = is_terminating(copied_data)
+        check, acc = is_terminating(data, patch=i)
 
         if check:
             return acc
 
 
-data = get_data("day08", line_parser)
-print(part2(data))
+if __name__ == "__main__":
+    data = get_data("day08", program_parser)
+    print(part2(data))
@@ -74,8 +74,9 @@ def part1(data: List[str]) -> int:
             return int(target)
 
 
-data = get_data("day09", line_parser)
-print(part1(data))
+if __name__ == "__main__":
+    data = get_data("day09", line_parser)
+    print(part1(data))
 
 
 # --- Part Two ---
@@ -131,5 +132,6 @@ def part2(data: List[str]) -> int:
             return min(int_data[start:stop]) + max(int_data[start:stop])
 
 
-data = get_data("day09", line_parser)
-print(part2(data))
+if __name__ == "__main__":
+    data = get_data("day09", line_parser)
+    print(part2(data))
@@ -107,8 +107,9 @@ def part1(data: List[int]) -> int:
     return difference_count[1] * difference_count[3]
 
 
-data = get_data("day10", int_parser)
-print(part1(data))
+if __name__ == "__main__":
+    data = get_data("day10", buffer_int_parser, mapped=True)
+    print(part1(data))
 
 
 # --- Part Two ---
@@ -186,8 +187,9 @@ def part2(data: List[int]) -> int:
     return possibilities
 
 
-data = get_data("day10", int_parser)
-print(part2(data))
+if __name__ == "__main__":
+    data = get_data("day10", buffer_int_parser, mapped=True)
+    print(part2(data))
 
 
 # TEST
@@ -204,7 +206,8 @@ test1 = """16
 4
 """
 
-print(part2([int(i) for i in test1.splitlines()]))
+if __name__ == "__main__":
+    print(part2([int(i) for i in test1.splitlines()]))
 
 test2 = """28
 33
@@ -238,4 +241,5 @@ test2 = """28
 10
 3
 """
-print(part2([int(i) for i in test2.splitlines()]))
+if __name__ == "__main__":
+    print(part2([int(i) for i in test2.splitlines()]))
@@ -167,8 +167,9 @@ def part1(data: List[int]) -> int:
         prev_seat_map = seating.seat_map
 
 
-data = get_data("day11", grid_parser)
-print(part1(data))
+if __name__ == "__main__":
+    data = get_data("day11", grid_parser)
+    print(part1(data))
 
 
 # TEST
@@ -183,7 +184,8 @@ LLLLLLLLLL
 L.LLLLLL.L
 L.LLLLL.LL
 """
-print(part1(grid_parser(test1)))
+if __name__ == "__main__":
+    print(part1(grid_parser(test1)))
 
 
 # --- Part Two ---
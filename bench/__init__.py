@@ -0,0 +1,2 @@
+from bench.generators import GENERATORS, generate
+from bench.harness import SIZES, bench_part, compare, fit_complexity
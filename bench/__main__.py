@@ -0,0 +1,75 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+from bench.harness import SIZES, bench_part, compare, fit_complexity
+from runner.days import PARTS, ROOT
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description="Benchmark day parts on synthetic inputs"
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-p", "--part", type=int, choices=(1, 2), action="append")
+    parser.add_argument("-s", "--scale", type=float, default=1.0, help="size factor")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_intermixed_args(argv)
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "samples": [],
+        "complexity": {},
+    }
+
+    for day in args.days or sorted(PARTS):
+        sizes = [max(int(size * args.scale), 1) for size in SIZES[day]]
+        for part in args.part or sorted(PARTS[day]):
+            if part not in PARTS[day]:
+                continue
+
+            samples = list(bench_part(day, part, sizes, args.min_time))
+            complexity = fit_complexity(samples)
+            results["samples"].extend(sample._asdict() for sample in samples)
+            results["complexity"][f"{day:02d}.{part}"] = complexity
+
+            for sample in samples:
+                print(
+                    f"day {day:02d} part {part} n={sample.size}:"
+                    f" {sample.ops_per_sec:.1f} ops/s, peak {sample.peak} B"
+                )
+            print(f"day {day:02d} part {part}: {complexity}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Synthetic puzzle inputs, one generator per day.
+
+Each generator takes a size and a random.Random and returns the input text in
+that day's format, shaped so every part function terminates with an answer.
+"""
+import random
+import string
+from typing import Callable, Dict
+
+FIELDS = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid", "cid"]
+EYE_COLORS = ["amb", "blu", "brn", "gry", "grn", "hzl", "oth", "xry"]
+
+
+def expenses(size: int, rng: random.Random) -> str:
+    # Fillers above 1010 never pair up, so the planted entries decide the answer
+    nums = [rng.randint(1011, 2019) for _ in range(max(size - 5, 0))]
+    nums += [600, 1420, 200, 300, 1520]
+    return "\n".join(map(str, nums))
+
+
+def password_policies(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        low = rng.randint(1, 10)
+        high = rng.randint(low + 1, 20)
+        letter = rng.choice("abcdefghij")
+        password = "".join(rng.choices("abcdefghij", k=rng.randint(high, high + 5)))
+        lines.append(f"{low}-{high} {letter}: {password}")
+
+    return "\n".join(lines)
+
+
+def tree_map(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices(".#", weights=(3, 1), k=31)) for _ in range(size)
+    )
+
+
+def passport_field(key: str, rng: random.Random) -> str:
+    if key == "byr":
+        return str(rng.randint(1900, 2010))
+    if key == "iyr":
+        return str(rng.randint(2005, 2025))
+    if key == "eyr":
+        return str(rng.randint(2015, 2035))
+    if key == "hgt":
+        return rng.choice([f"{rng.randint(140, 200)}cm", f"{rng.randint(50, 80)}in"])
+    if key == "hcl":
+        return "#" + "".join(rng.choices("0123456789abcdef", k=6))
+    if key == "ecl":
+        return rng.choice(EYE_COLORS)
+    if key == "pid":
+        return "".join(rng.choices(string.digits, k=rng.choice([8, 9, 9, 10])))
+    return str(rng.randint(1, 999))
+
+
+def passports(size: int, rng: random.Random) -> str:
+    records = []
+    for _ in range(size):
+        keys = [key for key in FIELDS if rng.random() < 0.9]
+        fields = [f"{key}:{passport_field(key, rng)}" for key in keys]
+
+        # Passports wrap over a couple of lines like the real batches
+        cut = rng.randint(0, len(fields))
+        records.append(" ".join(fields[:cut]) + "\n" + " ".join(fields[cut:]))
+
+    return "\n\n".join(record.strip("\n") for record in records)
+
+
+def boarding_passes(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices("FB", k=7)) + "".join(rng.choices("LR", k=3))
+        for _ in range(size)
+    )
+
+
+def customs_groups(size: int, rng: random.Random) -> str:
+    groups = []
+    for _ in range(size):
+        people = rng.randint(1, 5)
+        groups.append(
+            "\n".join(
+                "".join(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+                for _ in range(people)
+            )
+        )
+
+    return "\n\n".join(groups)
+
+
+def bag_rules(size: int, rng: random.Random) -> str:
+    # Bags only contain later bags, so the rules form a DAG
+    names = [f"shade{i} hue{i}" for i in range(max(size, 2))]
+    names[len(names) // 2] = "shiny gold"
+
+    lines = []
+    for idx, name in enumerate(names):
+        later = range(idx + 1, len(names))
+        picks = rng.sample(later, min(len(later), rng.choice([0, 1, 1, 2])))
+        children = [names[pick] for pick in picks]
+        if children:
+            contents = ", ".join(
+                f"{count} {child} bag{'s' if count > 1 else ''}"
+                for child in children
+                for count in [rng.randint(1, 5)]
+            )
+        else:
+            contents = "no other bags"
+        lines.append(f"{name} bags contain {contents}.")
+
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def boot_code(size: int, rng: random.Random) -> str:
+    # Forward code ending in a jump back to the start; only flipping that
+    # final jmp lets the program terminate
+    size = max(size, 2)
+    lines = []
+    for idx in range(size - 1):
+        op = rng.choice(["acc", "acc", "nop", "jmp"])
+        if op == "acc":
+            lines.append(f"acc {rng.randint(-50, 50):+d}")
+        elif op == "nop":
+            lines.append("nop +1")
+        else:
+            lines.append(f"jmp {rng.randint(1, min(3, size - 1 - idx)):+d}")
+
+    lines.append(f"jmp {-(size - 1):+d}")
+    return "\n".join(lines)
+
+
+def xmas_stream(size: int, rng: random.Random) -> str:
+    preamble = 25
+    nums = rng.sample(range(1, 100), preamble)
+    while len(nums) < max(size - 1, preamble + 50):
+        window = nums[-preamble:]
+        a, b = rng.sample(window, 2)
+        nums.append(a + b)
+
+    # The invalid number is a contiguous run from the middle, which is far
+    # smaller than any pair sum in the final window
+    window = nums[-preamble:]
+    pair_sums = {a + b for a in window for b in window if a != b}
+    mid = len(nums) // 2
+    while sum(nums[mid : mid + 3]) in pair_sums:
+        mid -= 1
+    nums.append(sum(nums[mid : mid + 3]))
+
+    return "\n".join(map(str, nums))
+
+
+def adapters(size: int, rng: random.Random) -> str:
+    joltage, nums, run = 0, [], 0
+    for _ in range(size):
+        # Day 10 only tabulates runs of up to five 1-jolt steps
+        step = 1 if run < 4 and rng.random() < 0.7 else 3
+        run = run + 1 if step == 1 else 0
+        joltage += step
+        nums.append(joltage)
+
+    rng.shuffle(nums)
+    return "\n".join(map(str, nums))
+
+
+def seat_grid(size: int, rng: random.Random) -> str:
+    # size is the number of cells in a roughly square layout
+    side = max(int(size ** 0.5), 1)
+    return "\n".join(
+        "".join(rng.choices("L.", weights=(4, 1), k=side)) for _ in range(side)
+    )
+
+
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = {
+    1: expenses,
+    2: password_policies,
+    3: tree_map,
+    4: passports,
+    5: boarding_passes,
+    6: customs_groups,
+    7: bag_rules,
+    8: boot_code,
+    9: xmas_stream,
+    10: adapters,
+    11: seat_grid,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, random.Random(f"{day}:{size}:{seed}"))
@@ -0,0 +1,102 @@
+import math
+import time
+import tracemalloc
+from collections import namedtuple
+from typing import Dict, List
+
+from bench.generators import generate
+from runner.days import PARTS, get_parser, load_day
+
+Sample = namedtuple("Sample", ["day", "part", "size", "seconds", "ops_per_sec", "peak"])
+
+# Sizes per day, kept small enough that the slowest parts stay in seconds
+SIZES: Dict[int, List[int]] = {
+    1: [50, 100, 200],
+    2: [1000, 4000, 16000],
+    3: [1000, 4000, 16000],
+    4: [250, 1000, 4000],
+    5: [250, 500, 1000],
+    6: [500, 2000, 8000],
+    7: [100, 200, 400],
+    8: [100, 200, 400],
+    9: [100, 200, 400],
+    10: [1000, 4000, 16000],
+    11: [100, 400, 900],
+}
+
+COMPLEXITIES = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n ** 2,
+    "O(n^3)": lambda n: n ** 3,
+}
+
+
+def time_call(function, args, min_time: float) -> float:
+    """Best time per call over repeats filling at least min_time seconds."""
+    best, spent = math.inf, 0.0
+    while spent < min_time or best == math.inf:
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+        best, spent = min(best, elapsed), spent + elapsed
+
+    return best
+
+
+def peak_memory(function, args) -> int:
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_part(day: int, part: int, sizes: List[int], min_time=0.2, seed=0):
+    spec = PARTS[day][part]
+    function = getattr(load_day(day), f"part{part}")
+    parser = get_parser(day, part)
+
+    for size in sizes:
+        args = (parser(generate(day, size, seed)),) + spec.args
+        seconds = time_call(function, args, min_time)
+        yield Sample(day, part, size, seconds, 1 / seconds, peak_memory(function, args))
+
+
+def fit_complexity(samples: List[Sample]) -> str:
+    """Name the growth model whose least-squares fit has the smallest error."""
+    if len(samples) < 2:
+        return "unknown"
+
+    best, best_error = "unknown", math.inf
+    for name, model in COMPLEXITIES.items():
+        xs = [model(sample.size) for sample in samples]
+        ys = [sample.seconds for sample in samples]
+        scale = sum(x * y for x, y in zip(xs, ys)) / sum(x * x for x in xs)
+
+        # Relative residuals, so the largest size does not dominate
+        error = sum(((scale * x - y) / y) ** 2 for x, y in zip(xs, ys))
+        if error < best_error:
+            best, best_error = name, error
+
+    return best
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.25) -> List[str]:
+    """Describe every sample that got slower than threshold times the baseline."""
+    old = {(s["day"], s["part"], s["size"]): s for s in baseline["samples"]}
+
+    regressions = []
+    for sample in current["samples"]:
+        before = old.get((sample["day"], sample["part"], sample["size"]))
+        if before and sample["seconds"] > before["seconds"] * threshold:
+            old_ms, new_ms = before["seconds"] * 1000, sample["seconds"] * 1000
+            regressions.append(
+                f"day {sample['day']:02d} part {sample['part']} n={sample['size']}:"
+                f" {old_ms:.3f} ms -> {new_ms:.3f} ms"
+            )
+
+    return regressions
@@ -0,0 +1,69 @@
+import importlib.util
+import io
+
+from common.util import *
+
+
+def test_mapped_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "lines").write_bytes(b"12\r\n3\n45")
+
+    assert get_data("lines", buffer_int_parser, mapped=True, cached=False) == [
+        12,
+        3,
+        45,
+    ]
+    assert get_data("lines", buffer_lines, mapped=True, cached=False) == [
+        b"12",
+        b"3",
+        b"45",
+    ]
+
+    views = get_data(
+        "lines", lambda buf: [memoryview(buf)[:2]], mapped=True, cached=False
+    )
+    assert bytes(views[0]) == b"12"
+
+
+def test_chunk_records():
+    text = "\n\nab\ncd\n\ne\n\n\n\nfg h\n\n\n\n\ni\nj\n\n"
+    for chunk_size in (1, 2, 3, 7, CHUNK_SIZE):
+        records = list(chunk_records(io.StringIO(text), chunk_size=chunk_size))
+        assert records == record_parser(text) == ["ab\ncd", "e", "fg h", "i\nj"]
+
+    lines = list(chunk_lines(io.StringIO("ab\ncd\n\ne"), chunk_size=3))
+    assert lines == "ab\ncd\n\ne".split("\n")
+
+
+def test_parse_cache(tmp_path):
+    path = tmp_path / "input"
+    path.write_text("1\n2\n")
+    load = lambda: int_parser(path.read_text())
+
+    cache = ParseCache(disk_dir=tmp_path / "cache")
+    assert cache.get(path, int_parser, False, load) == [1, 2]
+    assert cache.get(path, int_parser, False, load) == [1, 2]
+    assert cache.info() == CacheInfo(1, 0, 1, 1)
+
+    # A fresh process finds the pickle instead of parsing again
+    cache = ParseCache(disk_dir=tmp_path / "cache")
+    assert cache.get(path, int_parser, False, load) == [1, 2]
+    assert cache.info() == CacheInfo(0, 1, 0, 1)
+
+    # Editing anything in the parser's module changes its key, even a
+    # helper the parser only calls
+    source = tmp_path / "parsers.py"
+    source.write_text("def helper(data):\n    return data.split()\n")
+    spec = importlib.util.spec_from_file_location("parsers", source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    before = cache.parser_id(module.helper)
+    source.write_text("def helper(data):\n    return data.split(',')\n")
+    assert cache.parser_id(module.helper) != before
+
+    # Pickles naming a class or module that is gone are misses, not errors
+    for stale in (b"cno_such_module\nThing\n.", b"cbuiltins\nno_such_name\n."):
+        (tmp_path / "stale.pickle").write_bytes(stale)
+        assert ParseCache.load_disk(tmp_path / "stale.pickle") is None
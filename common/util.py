@@ -1,5 +1,22 @@
-def solution(filename, function, parser):
-    return function(get_data(filename, parser))
+import hashlib
+import mmap
+import os
+import pickle
+from collections import OrderedDict, namedtuple
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+CHUNK_SIZE = 1 << 16
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "disk_hits", "misses", "currsize"])
+
+
+def solution(filename, function, parser, mapped=False, stream=False):
+    if stream:
+        with stream_data(filename, parser) as data:
+            return function(data)
+
+    return function(get_data(filename, parser, mapped))
 
 
 def split_parser(data):
@@ -18,6 +35,333 @@ def grid_parser(data):
     return [[coord for coord in line] for line in data.splitlines()]
 
 
-def get_data(filename, parser):
+def record_parser(data):
+    return [record for record in map(str.strip, data.split("\n\n")) if record]
+
+
+# Buffer parsers take a bytes-like buffer (usually from map_data) and walk
+# line offsets instead of decoding the whole file into one str first.
+
+
+def line_offsets(buf):
+    start, end = 0, len(buf)
+
+    while start < end:
+        stop = buf.find(b"\n", start)
+        if stop == -1:
+            stop = end
+
+        # Drop the \r of \r\n endings like str.splitlines does
+        line_end = stop - 1 if stop > start and buf[stop - 1] == 13 else stop
+        yield start, line_end
+
+        start = stop + 1
+
+
+def buffer_lines(buf):
+    # Slicing copies, so lines stay valid after the map is closed
+    for start, stop in line_offsets(buf):
+        yield bytes(buf[start:stop])
+
+
+def buffer_split_parser(buf):
+    return [
+        word.decode()
+        for start, stop in line_offsets(buf)
+        for word in buf[start:stop].split()
+    ]
+
+
+def buffer_line_parser(buf):
+    return [buf[start:stop].decode() for start, stop in line_offsets(buf)]
+
+
+def buffer_int_parser(buf):
+    return [int(buf[start:stop]) for start, stop in line_offsets(buf)]
+
+
+def buffer_grid_parser(buf):
+    return [list(buf[start:stop].decode()) for start, stop in line_offsets(buf)]
+
+
+# Stream parsers take an open file and lazily yield records, reading it in
+# CHUNK_SIZE pieces so memory stays bounded by the longest line or record.
+
+
+def chunk_split(f, delimiter, chunk_size=CHUNK_SIZE):
+    tail = ""
+
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+
+        pieces = (tail + chunk).split(delimiter)
+        tail = pieces.pop()
+        yield from pieces
+
+    if tail:
+        yield tail
+
+
+def chunk_lines(f, chunk_size=CHUNK_SIZE):
+    return chunk_split(f, "\n", chunk_size)
+
+
+def chunk_records(f, chunk_size=CHUNK_SIZE):
+    """Yield blank-line-delimited records, each with its lines still joined."""
+    for record in chunk_split(f, "\n\n", chunk_size):
+        # Runs of blank lines leave stray newlines or empty pieces behind
+        record = record.strip()
+        if record:
+            yield record
+
+
+def split_stream(f):
+    for line in chunk_lines(f):
+        yield from line.split()
+
+
+def line_stream(f):
+    return chunk_lines(f)
+
+
+def int_stream(f):
+    return (int(line) for line in chunk_lines(f))
+
+
+def grid_stream(f):
+    return (list(line) for line in chunk_lines(f))
+
+
+def record_stream(f):
+    return chunk_records(f)
+
+
+@contextmanager
+def stream_data(filename, parser):
+    with open(f"data/{filename}") as f:
+        yield parser(f)
+
+
+# Byte ranges let worker processes each take a slice of one input file.
+# Every boundary falls just after a delimiter, so no record is split.
+
+
+def byte_ranges(path, parts, delimiter=b"\n"):
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            bounds = [0]
+            for i in range(1, parts):
+                pos = buf.find(delimiter, max(size * i // parts, bounds[-1]))
+                if pos == -1:
+                    break
+                if pos + len(delimiter) > bounds[-1]:
+                    bounds.append(pos + len(delimiter))
+
+    if bounds[-1] < size:
+        bounds.append(size)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def range_chunks(path, start, end, chunk_size=CHUNK_SIZE, delimiter=b"\n"):
+    """Yield text from path[start:end] in pieces that end on a delimiter."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        tail, remaining = b"", end - start
+
+        while remaining > 0:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+
+            block = tail + block
+            cut = block.rfind(delimiter)
+            if cut == -1:
+                tail = block
+                continue
+
+            cut += len(delimiter)
+            tail = block[cut:]
+            yield block[:cut].decode()
+
+        if tail:
+            yield tail.decode()
+
+
+def map_data(filename):
+    """Memory-map data/<filename> read-only; the caller closes it."""
+    with open(f"data/{filename}", "rb") as f:
+        # mmap refuses empty files
+        if f.seek(0, 2) == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def source_digest(paths):
+    """Hash the contents of source files; None when one cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        for path in paths:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    except OSError:
+        return None
+
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """Parsed inputs keyed on file path, mtime, size and parser source.
+
+    Entries live in an in-process LRU and, when disk_dir is set, are also
+    pickled there so later runs skip the parse. Cached values are shared,
+    so callers must not mutate what get_data returns.
+    """
+
+    def __init__(self, maxsize=32, disk_dir=None, disk_max_bytes=256 << 20):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.entries = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+
+    @staticmethod
+    def parser_id(parser):
+        code = getattr(parser, "__code__", None)
+        source = code.co_filename if code else __file__
+
+        # Parsers are mostly thin wrappers, so hash the whole module they
+        # live in, plus this one, to drop pickles from before any edit there
+        digest = source_digest(dict.fromkeys([source, __file__])) or "<unreadable>"
+        return f"{parser.__module__}.{parser.__qualname__}@{source}:{digest}"
+
+    def disk_path(self, key):
+        path, mtime, size, parser, mapped = key
+        if self.disk_dir is None:
+            return None
+
+        parser_id = self.parser_id(parser)
+        if "<" in parser_id:
+            # Lambdas, local functions and unreadable sources have no stable
+            # identity across runs
+            return None
+
+        name = repr((path, mtime, size, parser_id, mapped))
+        digest = hashlib.sha256(name.encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.pickle")
+
+    def get(self, path, parser, mapped, load):
+        st = os.stat(path)
+        key = (os.path.realpath(path), st.st_mtime_ns, st.st_size, parser, mapped)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        disk_path = self.disk_path(key)
+        value = self.load_disk(disk_path) if disk_path else None
+
+        if value is not None:
+            self.disk_hits += 1
+        else:
+            value = load()
+            self.misses += 1
+            if disk_path:
+                self.store(disk_path, value)
+
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+        return value
+
+    @staticmethod
+    def load_disk(disk_path):
+        try:
+            with open(disk_path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        except (AttributeError, ImportError):
+            # The pickle names a class or module that no longer exists
+            return None
+
+        os.utime(disk_path)
+        return value
+
+    def store(self, disk_path, value):
+        os.makedirs(self.disk_dir, exist_ok=True)
+        tmp_path = f"{disk_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, disk_path)
+
+        self.evict()
+
+    def evict(self):
+        # Drop least recently used pickles until the tier fits its budget
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pickle"):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def info(self):
+        return CacheInfo(self.hits, self.disk_hits, self.misses, len(self.entries))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+
+parse_cache = ParseCache(disk_dir=os.environ.get("AOC_CACHE_DIR"))
+
+
+def cache_info():
+    return parse_cache.info()
+
+
+def get_data(filename, parser, mapped=False, cached=True):
+    if cached:
+        return parse_cache.get(
+            f"data/{filename}",
+            parser,
+            mapped,
+            lambda: get_data(filename, parser, mapped, cached=False),
+        )
+
+    if mapped:
+        buf = map_data(filename)
+        try:
+            data = parser(buf)
+            # A lazy parser would otherwise read from the map after it closes
+            if isinstance(data, Iterator):
+                data = list(data)
+            return data
+        finally:
+            if isinstance(buf, mmap.mmap):
+                try:
+                    buf.close()
+                except BufferError:
+                    # The parser kept views into the map; it is unmapped
+                    # once the last of them is freed
+                    pass
+
     with open(f"data/{filename}") as f:
         return parser(f.read())
+
@@ -0,0 +1,76 @@
+from array import array
+from collections import namedtuple
+from typing import Iterable, Optional
+
+# Opcodes, plus the nop <-> jmp swap used to patch a single instruction
+NOP, ACC, JMP = 0, 1, 2
+OPCODES = {"nop": NOP, "acc": ACC, "jmp": JMP}
+SWAPPED = {NOP: JMP, ACC: ACC, JMP: NOP}
+
+# How a run ended
+HALT, LOOP, LIMIT, FAULT = "halt", "loop", "limit", "fault"
+
+Program = namedtuple("Program", ["ops", "args"])
+Outcome = namedtuple("Outcome", ["status", "accumulator", "pointer", "steps"])
+
+
+def decode(lines: Iterable[str]) -> Program:
+    """Decode boot code once into parallel opcode/argument arrays."""
+    ops, args = array("b"), array("i")
+    for line in lines:
+        if not line:
+            continue
+
+        op, arg = line.split()
+        ops.append(OPCODES[op])
+        args.append(int(arg))
+
+    return Program(ops, args)
+
+
+def program_parser(data: str) -> Program:
+    return decode(data.splitlines())
+
+
+def run(
+    program: Program,
+    patch: Optional[int] = None,
+    step_limit: Optional[int] = None,
+    detect_loops: bool = True,
+) -> Outcome:
+    """Execute program from instruction 0.
+
+    patch swaps nop and jmp at that one index without copying the program.
+    The run stops with HALT on stepping just past the last instruction, LOOP
+    on reaching an instruction a second time, LIMIT after step_limit steps
+    and FAULT on jumping anywhere else outside the program.
+    """
+    ops, args = program
+    size = len(ops)
+    visited = bytearray(size)
+    accumulator = ptr = steps = 0
+
+    while True:
+        if ptr == size:
+            return Outcome(HALT, accumulator, ptr, steps)
+        if not 0 <= ptr < size:
+            return Outcome(FAULT, accumulator, ptr, steps)
+        if detect_loops:
+            if visited[ptr]:
+                return Outcome(LOOP, accumulator, ptr, steps)
+            visited[ptr] = 1
+        if steps == step_limit:
+            return Outcome(LIMIT, accumulator, ptr, steps)
+        steps += 1
+
+        op = ops[ptr]
+        if ptr == patch:
+            op = SWAPPED[op]
+
+        if op == ACC:
+            accumulator += args[ptr]
+            ptr += 1
+        elif op == JMP:
+            ptr += args[ptr]
+        else:
+            ptr += 1
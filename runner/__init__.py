@@ -0,0 +1,9 @@
+from runner.days import PARTS, get_parser, get_part, load_day
+from runner.measure import Measurement, measure
+
+
+def run_part(day: int, part: int, trace_memory: bool = True) -> Measurement:
+    # Parsing is cached, so it stays outside the measured call
+    function, args = get_part(day, part)
+
+    return measure(function, *args, trace_memory=trace_memory)
@@ -0,0 +1,69 @@
+import argparse
+import os
+
+from runner import PARTS, run_part
+from runner.days import ROOT
+from runner.pool import run_parallel
+
+
+def format_bytes(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m runner", description="Run Advent of Code 2020 days"
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-p", "--part", type=int, choices=(1, 2), action="append")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip tracemalloc peak tracking"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        nargs="?",
+        const=0,
+        help="run parts on a process pool of JOBS workers (default: one per CPU)",
+    )
+    args = parser.parse_intermixed_args(argv)
+
+    # Inputs live under data/ in the repo root, wherever we were started from
+    os.chdir(ROOT)
+
+    jobs = []
+    for day in args.days or sorted(PARTS):
+        if day not in PARTS:
+            parser.error(f"unknown day {day}")
+
+        parts = args.part or sorted(PARTS[day])
+        jobs.extend((day, part) for part in parts if part in PARTS[day])
+
+    if args.jobs is not None:
+        results = run_parallel(
+            jobs, max_workers=args.jobs or None, trace_memory=not args.no_memory
+        )
+    else:
+        results = (
+            (day, part, run_part(day, part, trace_memory=not args.no_memory))
+            for day, part in jobs
+        )
+
+    for day, part, result in results:
+        print(
+            f"day {day:02d} part {part}: {result.answer}"
+            f"  (wall {result.wall * 1000:.2f} ms,"
+            f" cpu {result.cpu * 1000:.2f} ms,"
+            f" peak {format_bytes(result.peak)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import importlib.util
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from common.util import (
+    get_data,
+    grid_parser,
+    int_parser,
+    line_parser,
+    record_parser,
+    split_parser,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# How each day's part functions are fed: input file, parser and extra args.
+# A parser given by name is looked up in the day's own module.
+Part = namedtuple("Part", ["filename", "parser", "args"])
+
+SLOPES = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+
+
+def both_parts(filename, parser, *args):
+    part = Part(filename, parser, args)
+    return {1: part, 2: part}
+
+
+PARTS = {
+    1: both_parts("day01", split_parser),
+    2: both_parts("day02", "policy_parser"),
+    3: {
+        1: Part("day03", "tree_map_parser", (3, 1)),
+        2: Part("day03", "tree_map_parser", (SLOPES,)),
+    },
+    4: both_parts("day04", record_parser),
+    5: both_parts("day05", "decode_passes", 128, 8),
+    6: both_parts("day06", record_parser),
+    7: both_parts("day07", "bag_graph_parser"),
+    8: both_parts("day08", "program_parser"),
+    9: both_parts("day09", line_parser),
+    10: both_parts("day10", int_parser),
+    11: {1: Part("day11", grid_parser, ())},
+}
+
+
+def load_day(day: int):
+    """Import NN.py as module dayNN; its __main__ prints do not run."""
+    name = f"day{day:02d}"
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, ROOT / f"{day:02d}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+
+    return module
+
+
+def get_parser(day: int, part: int):
+    parser = PARTS[day][part].parser
+    if isinstance(parser, str):
+        return getattr(load_day(day), parser)
+    return parser
+
+
+def get_part(day: int, part: int):
+    """Return the part function and the arguments to call it with."""
+    spec = PARTS[day][part]
+    function = getattr(load_day(day), f"part{part}")
+
+    return function, (get_data(spec.filename, get_parser(day, part)),) + spec.args
@@ -0,0 +1,27 @@
+import time
+import tracemalloc
+from collections import namedtuple
+
+Measurement = namedtuple("Measurement", ["answer", "wall", "cpu", "peak"])
+
+
+def measure(function, *args, trace_memory: bool = True) -> Measurement:
+    """Call function(*args), timing it and tracking its peak allocation.
+
+    peak is the largest traced heap size in bytes during the call, or None
+    when trace_memory is off (tracemalloc slows allocation-heavy code).
+    """
+    if trace_memory:
+        tracemalloc.start()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        answer = function(*args)
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    return Measurement(answer, wall, cpu, peak)
@@ -0,0 +1,61 @@
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from runner.days import ROOT
+from runner.measure import Measurement
+
+TIMINGS_PATH = ROOT / ".runner_timings.json"
+
+
+def load_timings(path=TIMINGS_PATH) -> Dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings: Dict[str, float], path=TIMINGS_PATH):
+    with open(path, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+
+def job_key(day: int, part: int) -> str:
+    return f"{day:02d}.{part}"
+
+
+def run_job(day: int, part: int, trace_memory: bool) -> Measurement:
+    # Imported here so each worker only loads the days it is handed
+    from runner import run_part
+
+    return run_part(day, part, trace_memory=trace_memory)
+
+
+def run_parallel(
+    jobs: List[Tuple[int, int]], max_workers=None, trace_memory=False
+) -> List[Tuple[int, int, Measurement]]:
+    """Run (day, part) jobs on a process pool, longest known job first.
+
+    Jobs without a recorded timing are assumed slow and start first, so the
+    suite finishes close to the time of its slowest part. Results come back
+    in day order and their wall times are saved for the next run.
+    """
+    timings = load_timings()
+    ordered = sorted(jobs, key=lambda job: -timings.get(job_key(*job), math.inf))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            (day, part): pool.submit(run_job, day, part, trace_memory)
+            for day, part in ordered
+        }
+        results = [
+            (day, part, futures[day, part].result()) for day, part in sorted(jobs)
+        ]
+
+    for day, part, result in results:
+        timings[job_key(day, part)] = result.wall
+    save_timings(timings)
+
+    return results